@@ -1,63 +1,81 @@
 #Station Uptime Calculator
 
 import sys
-from typing import Dict, List, Tuple
+from array import array
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+# array typecodes that can only hold non-negative values
+_UNSIGNED_TYPECODES = ('B', 'H', 'I', 'L', 'Q')
+
+# Accepted spellings of the report "up" field
+_UP_MAP = {b"true": True, b"false": False, b"True": True, b"False": False, b"TRUE": True, b"FALSE": False}
 
 #Parse the input file and extract station-charger mappings and availability reports.
-def parse_input_file(file_path: str) -> Tuple[Dict[int, List[int]], List[Tuple[int, int, int, bool]]]:
+#Reports are returned column-wise as compact parallel arrays: charger IDs (uint32),
+#start and end times (uint64) and up flags (one byte each).
+def parse_input_file(file_path: str) -> Tuple[Dict[int, List[int]], array, array, array, bytearray]:
 
     stations: Dict[int, List[int]] = {}
-    reports: List[Tuple[int, int, int, bool]] = []
+    charger_col = array('I')
+    start_col = array('Q')
+    end_col = array('Q')
+    up_col = bytearray()
+
+    seen_chargers: Set[int] = set()  # For validation
 
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        raise ValueError(f"Input file not found: {file_path}")
-    except IOError as e:
-        raise ValueError(f"Error reading input file: {e}")
+        # Iterate the file lazily so only one line is held in memory at a time.
+        # The format is plain ASCII, so lines are kept as bytes and never decoded.
+        with open(file_path, 'rb', buffering=1 << 20) as f:
+            numbered_lines = enumerate(f, 1)
 
-    # Track which section we're in
-    current_section = None
-    charger_to_station: Dict[int, int] = {}  # For validation
+            # Find the stations header; only blank lines may precede it
+            for line_num, line in numbered_lines:
+                line = line.strip()
 
-    for line_num, line in enumerate(lines, 1):
-        line = line.strip()
+                # Skip empty lines
+                if not line:
+                    continue
 
-        # Skip empty lines
-        if not line:
-            continue
+                if line == b"[Stations]":
+                    break
 
-        # Check for section headers
-        if line == "[Stations]":
-            current_section = "stations"
-            continue
-        elif line == "[Charger Availability Reports]":
-            current_section = "reports"
-            continue
+                raise ValueError(f"Data found before section header at line {line_num}")
+
+            # Phase 1: station lines, up to the reports section header
+            for line_num, line in numbered_lines:
+                line = line.strip()
 
-        if current_section == "stations":
-            parts = line.split()
-            if len(parts) < 1:
-                raise ValueError(f"Invalid station line at line {line_num}")
+                # Skip empty lines
+                if not line:
+                    continue
+
+                if line == b"[Charger Availability Reports]":
+                    break
+
+                parts = line.split()
+                if len(parts) < 1:
+                    raise ValueError(f"Invalid station line at line {line_num}")
+
+                try:
+                    station_id = int(parts[0])
+                    charger_ids = [int(part) for part in parts[1:]]
+                except ValueError:
+                    raise ValueError(f"Invalid integer at line {line_num}") from None
 
-            try:
-                station_id = int(parts[0])
                 if station_id < 0 or station_id > 4294967295:  # uint32 range
                     raise ValueError(f"Station ID out of uint32 range at line {line_num}")
 
-                charger_ids = []
-                for i in range(1, len(parts)):
-                    charger_id = int(parts[i])
+                for charger_id in charger_ids:
                     if charger_id < 0 or charger_id > 4294967295:  # uint32 range
                         raise ValueError(f"Charger ID out of uint32 range at line {line_num}")
 
                     # Check for duplicate charger IDs across stations
-                    if charger_id in charger_to_station:
+                    if charger_id in seen_chargers:
                         raise ValueError(f"Duplicate charger ID {charger_id} at line {line_num}")
 
-                    charger_to_station[charger_id] = station_id
-                    charger_ids.append(charger_id)
+                    seen_chargers.add(charger_id)
 
                 # Check for duplicate station IDs
                 if station_id in stations:
@@ -65,21 +83,24 @@ def parse_input_file(file_path: str) -> Tuple[Dict[int, List[int]], List[Tuple[i
 
                 stations[station_id] = charger_ids
 
-            except ValueError as e:
-                if "invalid literal" in str(e):
-                    raise ValueError(f"Invalid integer at line {line_num}")
-                raise
+            # Phase 2: every remaining non-empty line is a report, no section tracking needed
+            for line_num, line in numbered_lines:
+                line = line.strip()
 
-        elif current_section == "reports":
-            parts = line.split()
-            if len(parts) != 4:
-                raise ValueError(f"Invalid report format at line {line_num}: expected 4 fields")
+                # Skip empty lines
+                if not line:
+                    continue
 
-            try:
-                charger_id = int(parts[0])
-                start_time = int(parts[1])
-                end_time = int(parts[2])
-                up_str = parts[3].lower()
+                parts = line.split()
+                if len(parts) != 4:
+                    raise ValueError(f"Invalid report format at line {line_num}: expected 4 fields")
+
+                try:
+                    charger_id = int(parts[0])
+                    start_time = int(parts[1])
+                    end_time = int(parts[2])
+                except ValueError:
+                    raise ValueError(f"Invalid integer at line {line_num}") from None
 
                 # Validate ranges
                 if charger_id < 0 or charger_id > 4294967295:
@@ -90,11 +111,8 @@ def parse_input_file(file_path: str) -> Tuple[Dict[int, List[int]], List[Tuple[i
                     raise ValueError(f"End time out of uint64 range at line {line_num}")
 
                 # Validate up field
-                if up_str == "true":
-                    is_up = True
-                elif up_str == "false":
-                    is_up = False
-                else:
+                is_up = _UP_MAP.get(parts[3])
+                if is_up is None:
                     raise ValueError(f"Invalid up value at line {line_num}: must be 'true' or 'false'")
 
                 # Validate time range
@@ -102,31 +120,30 @@ def parse_input_file(file_path: str) -> Tuple[Dict[int, List[int]], List[Tuple[i
                     raise ValueError(f"Invalid time range at line {line_num}: start >= end")
 
                 # Validate charger exists
-                if charger_id not in charger_to_station:
+                if charger_id not in seen_chargers:
                     raise ValueError(f"Unknown charger ID {charger_id} at line {line_num}")
 
-                reports.append((charger_id, start_time, end_time, is_up))
-
-            except ValueError as e:
-                if "invalid literal" in str(e):
-                    raise ValueError(f"Invalid integer at line {line_num}")
-                raise
-
-        elif current_section is None:
-            raise ValueError(f"Data found before section header at line {line_num}")
+                charger_col.append(charger_id)
+                start_col.append(start_time)
+                end_col.append(end_time)
+                up_col.append(is_up)
+    except FileNotFoundError:
+        raise ValueError(f"Input file not found: {file_path}")
+    except IOError as e:
+        raise ValueError(f"Error reading input file: {e}")
 
     if not stations:
         raise ValueError("No stations defined in input file")
 
-    return stations, reports
+    return stations, charger_col, start_col, end_col, up_col
 
 #Merge overlapping intervals.
 def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
     if not intervals:
         return []
 
-    # Sort by start time
-    sorted_intervals = sorted(intervals)
+    # Sort by start time only; ties in any order merge the same way
+    sorted_intervals = sorted(intervals, key=itemgetter(0))
     merged = [sorted_intervals[0]]
 
     for start, end in sorted_intervals[1:]:
@@ -145,53 +162,175 @@ def merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
 def calculate_total_time(intervals: List[Tuple[int, int]]) -> int:
     return sum(end - start for start, end in intervals)
 
-#Calculate uptime percentage for each station
+#Calculate total time covered by intervals given as parallel start/end columns,
+#merging overlaps without building the merged list
+def merged_total_time(starts: Sequence[int], ends: Sequence[int]) -> int:
+    if not starts:
+        return 0
+
+    # Fast path: reports usually arrive in time order without overlaps, so try summing
+    # directly and only sort and merge if an interval starts before the previous one ends
+    total = 0
+    prev_end = 0
+    for start, end in zip(starts, ends):
+        if start < prev_end:
+            break
+        total += end - start
+        prev_end = end
+    else:
+        return total
+
+    # Visit the intervals in start order via an index sort, leaving the columns untouched
+    order = sorted(range(len(starts)), key=starts.__getitem__)
+    cur_start = starts[order[0]]
+    cur_end = ends[order[0]]
+    total = 0
+
+    for i in order:
+        start = starts[i]
+        end = ends[i]
+        if start <= cur_end:
+            if end > cur_end:
+                cur_end = end
+        else:
+            total += cur_end - cur_start
+            cur_start, cur_end = start, end
+
+    return total + cur_end - cur_start
+
+#Build the charger -> station lookup. When charger IDs are densely packed, a list indexed
+#by charger ID is used instead of a dict, as indexing it is cheaper than hashing.
+def build_charger_lookup(stations: Dict[int, List[int]]) -> Union[List[Optional[int]], Dict[int, int]]:
+    charger_to_station: Dict[int, int] = {
+        charger_id: station_id
+        for station_id, charger_ids in stations.items()
+        for charger_id in charger_ids
+    }
+
+    if not charger_to_station:
+        return charger_to_station
+
+    # Only use a list when it stays within a small multiple of the number of chargers
+    max_charger_id = max(charger_to_station)
+    if max_charger_id >= 16 * len(charger_to_station):
+        return charger_to_station
+
+    lookup: List[Optional[int]] = [None] * (max_charger_id + 1)
+    for charger_id, station_id in charger_to_station.items():
+        lookup[charger_id] = station_id
+
+    return lookup
+
+#Calculate uptime percentage for each station.
+#The returned dict is ordered by ascending station ID.
+#Raises ValueError if a report names a charger not assigned to any station.
 def calculate_station_uptime(
     stations: Dict[int, List[int]],
-    reports: List[Tuple[int, int, int, bool]]
+    charger_col: Sequence[int],
+    start_col: Sequence[int],
+    end_col: Sequence[int],
+    up_col: Sequence[int]
 ) -> Dict[int, int]:
     # Build charger to station mapping
-    charger_to_station: Dict[int, int] = {}
-    for station_id, charger_ids in stations.items():
-        for charger_id in charger_ids:
-            charger_to_station[charger_id] = station_id
-
-    # Group reports by station
-    station_reports: Dict[int, List[Tuple[int, int, bool]]] = {sid: [] for sid in stations}
-
-    for charger_id, start_time, end_time, is_up in reports:
-        station_id = charger_to_station[charger_id]
-        station_reports[station_id].append((start_time, end_time, is_up))
+    charger_to_station = build_charger_lookup(stations)
+
+    # A negative index would wrap around a list lookup, so reject negative IDs up front.
+    # Unsigned typed arrays, as returned by parse_input_file, cannot hold them.
+    if (isinstance(charger_to_station, list) and charger_col
+            and getattr(charger_col, 'typecode', None) not in _UNSIGNED_TYPECODES):
+        lowest_charger_id = min(charger_col)
+        if lowest_charger_id < 0:
+            raise ValueError(f"Unknown charger ID {lowest_charger_id}")
+
+    # Stations with a single charger normally receive one ordered, non-overlapping timeline,
+    # so their up time is summed as reports arrive instead of collecting intervals.
+    # Per such station keep [up_time, last_up_end].
+    single_charger: Set[int] = {sid for sid, charger_ids in stations.items() if len(charger_ids) == 1}
+    single_sums: Dict[int, List[int]] = {}
+    unordered: Set[int] = set()
+
+    # Single pass over the reports: per station keep [min_start, max_end, up_starts, up_ends],
+    # with up intervals stored in compact uint64 columns. Single-charger stations leave the
+    # columns as None and accumulate into single_sums instead.
+    station_state: Dict[int, list] = {}
+
+    for charger_id, start_time, end_time, is_up in zip(charger_col, start_col, end_col, up_col):
+        try:
+            station_id = charger_to_station[charger_id]
+        except (KeyError, IndexError):
+            raise ValueError(f"Unknown charger ID {charger_id}") from None
+        state = station_state.get(station_id)
+
+        if state is None:
+            # Unused slots in a list lookup hold None; no station state is ever stored
+            # under None, so this only needs checking when a new station is seen
+            if station_id is None:
+                raise ValueError(f"Unknown charger ID {charger_id}")
+            if station_id in single_charger:
+                state = [start_time, end_time, None, None]
+                single_sums[station_id] = [0, 0]
+            else:
+                state = [start_time, end_time, array('Q'), array('Q')]
+            station_state[station_id] = state
+        else:
+            if start_time < state[0]:
+                state[0] = start_time
+            if end_time > state[1]:
+                state[1] = end_time
+
+        if is_up:
+            up_starts = state[2]
+            if up_starts is not None:
+                up_starts.append(start_time)
+                state[3].append(end_time)
+            else:
+                running = single_sums[station_id]
+                if start_time < running[1]:
+                    unordered.add(station_id)
+                running[0] += end_time - start_time
+                running[1] = end_time
+
+    # A single charger reported up intervals out of order or overlapping, so its running
+    # sum may double count. Drop the sum and collect the station's intervals in a second
+    # pass so they are merged like any other station's.
+    if unordered:
+        rescan_states = {}
+        for station_id in unordered:
+            del single_sums[station_id]
+            state = station_state[station_id]
+            state[2] = array('Q')
+            state[3] = array('Q')
+            rescan_states[stations[station_id][0]] = state
+
+        for charger_id, start_time, end_time, is_up in zip(charger_col, start_col, end_col, up_col):
+            if is_up:
+                state = rescan_states.get(charger_id)
+                if state is not None:
+                    state[2].append(start_time)
+                    state[3].append(end_time)
 
-    # Calculate uptime for each station
+    # Calculate uptime for each station, inserting in output order
     uptimes: Dict[int, int] = {}
 
-    for station_id, charger_ids in stations.items():
-        reports_for_station = station_reports[station_id]
+    for station_id in sorted(stations):
+        state = station_state.get(station_id)
 
-        if not reports_for_station:
+        if state is None:
             # No reports for this station - undefined behavior
             # We'll set uptime to 0 since there's no data
             uptimes[station_id] = 0
             continue
 
-        # Find the overall time period (min start to max end)
-        min_start = min(start for start, end, is_up in reports_for_station)
-        max_end = max(end for start, end, is_up in reports_for_station)
-        total_time = max_end - min_start
-
-        # Collect up intervals
-        up_intervals: List[Tuple[int, int]] = []
-
-        for start_time, end_time, is_up in reports_for_station:
-            if is_up:
-                up_intervals.append((start_time, end_time))
-
-        # Merge up intervals to handle overlaps
-        merged_up = merge_intervals(up_intervals)
+        # The overall time period runs from min start to max end
+        total_time = state[1] - state[0]
 
-        # Calculate up time
-        up_time = calculate_total_time(merged_up)
+        running = single_sums.get(station_id)
+        if running is not None:
+            # Already summed during the pass above
+            up_time = running[0]
+        else:
+            # Calculate up time, merging overlapping intervals
+            up_time = merged_total_time(state[2], state[3])
 
         if total_time == 0:
             uptimes[station_id] = 0
@@ -202,6 +341,12 @@ def calculate_station_uptime(
     return uptimes
 
 
+#Parse the input file and calculate uptime for each station, ordered by station ID
+def process_file(file_path: str) -> Dict[int, int]:
+    stations, *report_columns = parse_input_file(file_path)
+    return calculate_station_uptime(stations, *report_columns)
+
+
 def main():
     if len(sys.argv) != 2:
         print("ERROR", file=sys.stdout)
@@ -211,15 +356,11 @@ def main():
     input_file = sys.argv[1]
 
     try:
-        # Parse input file
-        stations, reports = parse_input_file(input_file)
-
-        # Calculate uptime for each station
-        uptimes = calculate_station_uptime(stations, reports)
+        # Parse input file and calculate uptime for each station
+        uptimes = process_file(input_file)
 
-        # Output results in ascending station ID order
-        for station_id in sorted(uptimes.keys()):
-            print(f"{station_id} {uptimes[station_id]}")
+        # Output results (already in ascending station ID order) as a single write
+        sys.stdout.write("".join(f"{station_id} {uptime}\n" for station_id, uptime in uptimes.items()))
 
     except ValueError as e:
         print("ERROR", file=sys.stdout)
@@ -2,14 +2,32 @@
 import pytest
 import tempfile
 import os
+from array import array
 from station_uptime import (
     parse_input_file,
     merge_intervals,
     calculate_total_time,
-    calculate_station_uptime
+    merged_total_time,
+    build_charger_lookup,
+    calculate_station_uptime,
+    process_file
 )
 
 
+def report_columns(reports):
+    """Split (charger_id, start, end, up) rows into the column arrays used by station_uptime."""
+    columns = (array('I'), array('Q'), array('Q'), bytearray())
+    for row in reports:
+        for column, value in zip(columns, row):
+            column.append(value)
+    return columns
+
+
+def interval_columns(intervals):
+    """Split (start, end) pairs into the start/end columns taken by merged_total_time."""
+    return array('Q', [start for start, end in intervals]), array('Q', [end for start, end in intervals])
+
+
 class TestMergeIntervals:
     """Tests for the interval merging algorithm."""
 
@@ -56,6 +74,11 @@ class TestMergeIntervals:
         intervals = [(0, 50), (0, 100)]
         assert merge_intervals(intervals) == [(0, 100)]
 
+    def test_long_interval_spans_later_ones(self):
+        """Test that a long interval keeps absorbing later, shorter ones."""
+        intervals = [(0, 100), (10, 20), (30, 40), (150, 160)]
+        assert merge_intervals(intervals) == [(0, 100), (150, 160)]
+
 
 class TestCalculateTotalTime:
     """Tests for total time calculation."""
@@ -79,6 +102,38 @@ class TestCalculateTotalTime:
         assert calculate_total_time(intervals) == 20000000000
 
 
+class TestMergedTotalTime:
+    """Tests for the fused merge-and-sum of intervals."""
+
+    def test_empty_intervals(self):
+        """Test with no intervals."""
+        assert merged_total_time(*interval_columns([])) == 0
+
+    def test_non_overlapping_intervals(self):
+        """Test disjoint intervals are summed."""
+        assert merged_total_time(*interval_columns([(0, 10), (20, 30), (40, 50)])) == 30
+
+    def test_overlapping_unsorted_intervals(self):
+        """Test overlaps are only counted once regardless of order."""
+        intervals = [(50, 100), (0, 30), (20, 60), (150, 160)]
+        assert merged_total_time(*interval_columns(intervals)) == 110
+
+    def test_sorted_adjacent_intervals(self):
+        """Test in-order intervals that touch are summed without double counting."""
+        assert merged_total_time(*interval_columns([(0, 10), (10, 20), (25, 30)])) == 25
+
+    def test_overlap_after_sorted_prefix(self):
+        """Test falling back to merging when a late interval overlaps an earlier one."""
+        intervals = [(0, 10), (20, 30), (40, 50), (5, 25)]
+        assert merged_total_time(*interval_columns(intervals)) == 40
+
+    def test_matches_merge_then_sum(self):
+        """Test agreement with merge_intervals + calculate_total_time."""
+        intervals = [(0, 100), (10, 20), (30, 40), (150, 160), (155, 170), (170, 180)]
+        expected = calculate_total_time(merge_intervals(intervals))
+        assert merged_total_time(*interval_columns(intervals)) == expected
+
+
 class TestParseInputFile:
     """Tests for input file parsing."""
 
@@ -98,13 +153,16 @@ class TestParseInputFile:
             f.flush()
 
             try:
-                stations, reports = parse_input_file(f.name)
+                stations, *columns = parse_input_file(f.name)
+                reports = list(zip(*columns))
 
                 assert stations == {0: [1001, 1002], 1: [1003]}
                 assert len(reports) == 3
                 assert (1001, 0, 100, True) in reports
                 assert (1002, 50, 150, False) in reports
                 assert (1003, 0, 200, True) in reports
+                assert [getattr(column, 'typecode', None) for column in columns] == ['I', 'Q', 'Q', None]
+                assert isinstance(columns[3], bytearray)
             finally:
                 os.unlink(f.name)
 
@@ -128,6 +186,25 @@ class TestParseInputFile:
             finally:
                 os.unlink(f.name)
 
+    def test_data_before_section_header(self):
+        """Test error when station data precedes the stations header."""
+        content = """0 1001
+[Stations]
+1 1002
+
+[Charger Availability Reports]
+1002 0 100 true
+"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write(content)
+            f.flush()
+
+            try:
+                with pytest.raises(ValueError, match="before section header"):
+                    parse_input_file(f.name)
+            finally:
+                os.unlink(f.name)
+
     def test_invalid_boolean(self):
         """Test error handling for invalid boolean value."""
         content = """[Stations]
@@ -146,6 +223,42 @@ class TestParseInputFile:
             finally:
                 os.unlink(f.name)
 
+    def test_invalid_integer(self):
+        """Test error handling for a non-numeric report field."""
+        content = """[Stations]
+0 1001
+
+[Charger Availability Reports]
+1001 zero 100 true
+"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write(content)
+            f.flush()
+
+            try:
+                with pytest.raises(ValueError, match="Invalid integer at line 5"):
+                    parse_input_file(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_invalid_charger_integer_in_stations(self):
+        """Test error handling for a non-numeric charger ID in the stations section."""
+        content = """[Stations]
+0 1001 abc
+
+[Charger Availability Reports]
+1001 0 100 true
+"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write(content)
+            f.flush()
+
+            try:
+                with pytest.raises(ValueError, match="Invalid integer at line 2"):
+                    parse_input_file(f.name)
+            finally:
+                os.unlink(f.name)
+
     def test_unknown_charger_id(self):
         """Test error handling for unknown charger ID in reports."""
         content = """[Stations]
@@ -232,13 +345,39 @@ class TestParseInputFile:
             f.flush()
 
             try:
-                stations, reports = parse_input_file(f.name)
+                stations, *columns = parse_input_file(f.name)
                 assert stations == {0: []}
-                assert reports == []
+                assert all(len(column) == 0 for column in columns)
             finally:
                 os.unlink(f.name)
 
 
+class TestBuildChargerLookup:
+    """Tests for the charger to station lookup."""
+
+    def test_dense_ids_use_list(self):
+        """Test densely packed charger IDs produce a list lookup."""
+        lookup = build_charger_lookup({0: [0, 1], 1: [2]})
+        assert lookup == [0, 0, 1]
+
+    def test_dense_ids_with_holes(self):
+        """Test unused slots in a dense lookup are left empty."""
+        lookup = build_charger_lookup({7: [3], 8: [1]})
+        assert isinstance(lookup, list)
+        assert lookup[3] == 7
+        assert lookup[1] == 8
+        assert lookup[0] is None
+
+    def test_sparse_ids_use_dict(self):
+        """Test widely spread charger IDs fall back to a dict."""
+        lookup = build_charger_lookup({0: [1001], 1: [4294967295]})
+        assert lookup == {1001: 0, 4294967295: 1}
+
+    def test_no_chargers(self):
+        """Test stations without chargers give an empty lookup."""
+        assert build_charger_lookup({0: []}) == {}
+
+
 class TestCalculateStationUptime:
     """Tests for station uptime calculation."""
 
@@ -247,7 +386,7 @@ class TestCalculateStationUptime:
         stations = {0: [1001]}
         reports = [(1001, 0, 100, True)]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
 
     def test_single_charger_always_down(self):
@@ -255,7 +394,7 @@ class TestCalculateStationUptime:
         stations = {0: [1001]}
         reports = [(1001, 0, 100, False)]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 0
 
     def test_single_charger_partial_uptime(self):
@@ -266,7 +405,7 @@ class TestCalculateStationUptime:
             (1001, 50, 100, False)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 50
 
     def test_multiple_chargers_overlap(self):
@@ -277,10 +416,53 @@ class TestCalculateStationUptime:
             (1002, 40, 100, True)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         # Up from 0-100, total 100
         assert uptimes[0] == 100
 
+    def test_single_charger_overlapping_reports(self):
+        """Test overlapping up reports from one charger are not double counted."""
+        stations = {0: [1001]}
+        reports = [
+            (1001, 0, 50, True),
+            (1001, 25, 75, True),
+            (1001, 75, 100, False)
+        ]
+
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
+        # Up from 0-75, total 100
+        assert uptimes[0] == 75
+
+    def test_single_charger_out_of_order_reports(self):
+        """Test one charger's reports arriving out of time order."""
+        stations = {0: [1001], 1: [1002]}
+        reports = [
+            (1001, 50, 100, True),
+            (1002, 0, 100, True),
+            (1001, 0, 40, True),
+            (1001, 20, 30, True)
+        ]
+
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
+        # Up: 40 + 50 = 90, Total: 100
+        assert uptimes[0] == 90
+        assert uptimes[1] == 100
+
+    def test_unordered_single_charger_next_to_multi_charger_station(self):
+        """Test the single-charger fallback does not disturb a multi-charger station."""
+        stations = {0: [1001], 1: [1002, 1003]}
+        reports = [
+            (1002, 0, 60, True),
+            (1001, 0, 50, True),
+            (1003, 40, 100, True),
+            (1001, 25, 75, True),
+            (1001, 75, 100, False)
+        ]
+
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
+        assert uptimes[0] == 75
+        assert uptimes[1] == 100
+
     def test_gap_counts_as_downtime(self):
         """Test that gaps between reports count as downtime."""
         stations = {0: [1001]}
@@ -289,7 +471,7 @@ class TestCalculateStationUptime:
             (1001, 100, 200, True)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         # Up: 50 + 100 = 150, Total: 200, Uptime: 75%
         assert uptimes[0] == 75
 
@@ -302,7 +484,7 @@ class TestCalculateStationUptime:
             (1001, 20, 30, True)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         # Up: 20, Total: 30, Uptime: 66.67% -> 66%
         assert uptimes[0] == 66
 
@@ -316,17 +498,29 @@ class TestCalculateStationUptime:
             (1003, 50, 100, False)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
         assert uptimes[1] == 0
         assert uptimes[2] == 50
 
+    def test_results_in_ascending_station_order(self):
+        """Test uptimes are returned ordered by station ID."""
+        stations = {7: [1001], 2: [1002], 5: [1003]}
+        reports = [
+            (1003, 0, 100, True),
+            (1001, 0, 100, False),
+            (1002, 0, 100, True)
+        ]
+
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
+        assert list(uptimes.items()) == [(2, 100), (5, 100), (7, 0)]
+
     def test_station_with_no_reports(self):
         """Test station with no charger reports."""
         stations = {0: [1001], 1: [1002]}
         reports = [(1001, 0, 100, True)]  # No reports for 1002
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
         assert uptimes[1] == 0
 
@@ -338,9 +532,31 @@ class TestCalculateStationUptime:
             (1001, 10000000000, 20000000000, False)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 50
 
+    def test_unknown_charger_in_dict_lookup(self):
+        """Test a report for an unassigned charger is rejected with sparse charger IDs."""
+        stations = {0: [1001]}
+        reports = [(9999, 0, 100, True)]
+
+        with pytest.raises(ValueError, match="Unknown charger ID 9999"):
+            calculate_station_uptime(stations, *report_columns(reports))
+
+    def test_unknown_charger_in_list_lookup(self):
+        """Test a report for an unassigned charger is rejected with dense charger IDs."""
+        stations = {0: [0, 2]}
+
+        with pytest.raises(ValueError, match="Unknown charger ID 1"):
+            calculate_station_uptime(stations, *report_columns([(1, 0, 100, True)]))
+
+        with pytest.raises(ValueError, match="Unknown charger ID 5"):
+            calculate_station_uptime(stations, *report_columns([(0, 0, 100, True), (5, 0, 100, True)]))
+
+        # Negative IDs must not wrap around to the end of the lookup list
+        with pytest.raises(ValueError, match="Unknown charger ID -1"):
+            calculate_station_uptime({0: [0, 1], 1: [2]}, [-1], [0], [10], [1])
+
     def test_input_1_example(self):
         """Test with input_1.txt example data."""
         stations = {0: [1001, 1002], 1: [1003], 2: [1004]}
@@ -353,7 +569,7 @@ class TestCalculateStationUptime:
             (1004, 100000, 200000, True)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
         assert uptimes[1] == 0
         assert uptimes[2] == 75
@@ -368,11 +584,39 @@ class TestCalculateStationUptime:
             (1, 0, 1, True)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 66
         assert uptimes[1] == 100
 
 
+class TestProcessFile:
+    """Tests for the end-to-end file processing entry point."""
+
+    def test_input_1_file(self):
+        """Test parsing and calculating uptime from a file in one call."""
+        content = """[Stations]
+0 1001 1002
+1 1003
+2 1004
+
+[Charger Availability Reports]
+1001 0 50000 true
+1001 50000 100000 true
+1002 50000 100000 true
+1003 25000 75000 false
+1004 0 50000 true
+1004 100000 200000 true
+"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write(content)
+            f.flush()
+
+            try:
+                assert list(process_file(f.name).items()) == [(0, 100), (1, 0), (2, 75)]
+            finally:
+                os.unlink(f.name)
+
+
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
 
@@ -381,7 +625,7 @@ class TestEdgeCases:
         stations = {0: [1001]}
         reports = [(1001, 0, 1, True)]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
 
     def test_charger_id_zero(self):
@@ -389,7 +633,7 @@ class TestEdgeCases:
         stations = {0: [0]}
         reports = [(0, 0, 100, True)]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
 
     def test_station_id_zero(self):
@@ -397,7 +641,7 @@ class TestEdgeCases:
         stations = {0: [1001]}
         reports = [(1001, 0, 100, True)]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 100
 
     def test_many_small_intervals(self):
@@ -406,7 +650,7 @@ class TestEdgeCases:
         # 10 intervals, alternating up/down
         reports = [(1001, i * 10, (i + 1) * 10, i % 2 == 0) for i in range(10)]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         # 5 up intervals out of 10, so 50%
         assert uptimes[0] == 50
 
@@ -418,7 +662,7 @@ class TestEdgeCases:
             (1001, 1, 100, False)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         assert uptimes[0] == 1
 
     def test_just_under_one_percent(self):
@@ -429,7 +673,7 @@ class TestEdgeCases:
             (1001, 1, 200, False)
         ]
 
-        uptimes = calculate_station_uptime(stations, reports)
+        uptimes = calculate_station_uptime(stations, *report_columns(reports))
         # 1/200 = 0.5% -> floors to 0%
         assert uptimes[0] == 0
 